@@ -1,14 +1,294 @@
+import numpy as np
 import pandas as pd
 import os
-import glob
+import csv
+import itertools
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
-def process_folder_csvs(folder_path):
+# Text that pd.read_csv reads as missing or boolean by default
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+BOOL_VALUES = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+def column_names(header):
+    """
+    Name header columns the way pd.read_csv does: blank names become 'Unnamed: <i>'
+    and repeated names get a '.1', '.2', ... suffix
+    
+    Parameters:
+    header (list of str): Raw header fields
+    
+    Returns:
+    list of str: Column names
+    """
+    
+    names = list(header)
+    unnamed = [i for i, name in enumerate(names) if name == '']
+    for i in unnamed:
+        names[i] = f"Unnamed: {i}"
+    
+    # Given names keep priority over generated ones, so unnamed columns are numbered last
+    counts = {}
+    taken = set(names)
+    for i in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+        name = base = names[i]
+        count = counts.get(name, 0)
+        
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in taken else counts.get(name, 0)
+        
+        names[i] = name
+        counts[name] = count + 1
+    
+    return names
+
+
+def load_csv(csv_file, timestamp):
+    """
+    Read a CSV file and add the seqno, create_ts and updt_ts columns,
+    using the multithreaded PyArrow parser when it is installed
+    
+    Parameters:
+    csv_file (str or Path): Path to the CSV file
+    timestamp (str): Value for the create_ts and updt_ts columns
+    
+    Returns:
+    pd.DataFrame: CSV data with seqno first and the timestamp columns last
+    """
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.csv
+    except ImportError:
+        df = pd.read_csv(csv_file)
+        
+        # Sequence number column
+        seqno = pd.DataFrame({'seqno': np.arange(1, len(df) + 1, dtype=np.int64)}, index=df.index)
+        
+        # Timestamps are stored once as a category, with int8 codes per row
+        timestamp_col = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[timestamp])
+        timestamps = pd.DataFrame({'create_ts': timestamp_col, 'updt_ts': timestamp_col}, index=df.index)
+        
+        # Build the output in its final column order with a single concat
+        return pd.concat([seqno, df, timestamps], axis=1)
+    
+    # Treat the same text as missing or boolean as pd.read_csv, in text columns too
+    convert_options = pyarrow.csv.ConvertOptions(
+        null_values=sorted(NA_VALUES),
+        strings_can_be_null=True,
+        true_values=[value for value, flag in BOOL_VALUES.items() if flag],
+        false_values=[value for value, flag in BOOL_VALUES.items() if not flag],
+    )
+    
+    # The PyArrow parser reports files with no data, including blank-line-only
+    # ones, and malformed rows as ArrowInvalid; raise the pandas parser errors
+    # instead so callers see the same exceptions with or without pyarrow
+    try:
+        # Infer the column types from the first block only, so date/time columns can
+        # be read as their original text in a single full parse; casting the parsed
+        # values back to strings would reformat them
+        with pyarrow.csv.open_csv(csv_file, convert_options=convert_options) as reader:
+            schema = reader.schema
+        convert_options.column_types = {
+            field.name: pa.string() for field in schema if pa.types.is_temporal(field.type)
+        }
+        
+        table = pyarrow.csv.read_csv(csv_file, convert_options=convert_options)
+    except pa.ArrowInvalid as e:
+        if "Empty CSV file" in str(e):
+            raise pd.errors.EmptyDataError("No columns to parse from file") from e
+        raise pd.errors.ParserError(str(e)) from e
+    
+    table = table.rename_columns(column_names(table.column_names))
+    
+    # Add the extra columns on the Arrow table so pandas converts the frame once;
+    # the timestamp is a one-entry dictionary, which becomes a Categorical
+    seqno = pa.array(np.arange(1, table.num_rows + 1, dtype=np.int32))
+    timestamp_col = pa.DictionaryArray.from_arrays(pa.array(np.zeros(table.num_rows, dtype=np.int8)), pa.array([timestamp]))
+    table = table.add_column(0, 'seqno', seqno)
+    table = table.append_column('create_ts', timestamp_col).append_column('updt_ts', timestamp_col)
+    
+    # Release the Arrow buffers as each column is converted
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def sheet_row_writer(writer, sheet_name):
+    """
+    Add a sheet to the workbook and return a function that appends one row to it
+    
+    Parameters:
+    writer (pd.ExcelWriter): Open xlsxwriter or write-only openpyxl Excel writer
+    sheet_name (str): Name of the sheet to create
+    
+    Returns:
+    callable: Function taking a sequence of cell values
+    """
+    
+    if writer.engine == 'xlsxwriter':
+        worksheet = writer.book.add_worksheet(sheet_name)
+        row_nums = itertools.count()
+        return lambda row: worksheet.write_row(next(row_nums), 0, row)
+    
+    # Write-only openpyxl sheets only support appending rows
+    worksheet = writer.book.create_sheet(sheet_name)
+    return worksheet.append
+
+
+def write_sheet(writer, sheet_name, df):
+    """
+    Write a dataframe to a new sheet row by row, without per-cell styling
+    
+    Parameters:
+    writer (pd.ExcelWriter): Open Excel writer
+    sheet_name (str): Name of the sheet to create
+    df (pd.DataFrame): Data to write, header first
+    """
+    
+    append_row = sheet_row_writer(writer, sheet_name)
+    
+    # Convert each column to a list in one pass; missing values become
+    # blank cells and infinities the text 'inf'/'-inf', like df.to_excel does
+    columns = []
+    for _, values in df.items():
+        if values.dtype.kind == 'f' and np.isinf(values.to_numpy()).any():
+            values = values.mask(values == np.inf, 'inf').mask(values == -np.inf, '-inf')
+        if values.hasnans:
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values.to_numpy().tolist())
+    
+    # Rows must still be appended in order for constant_memory mode
+    append_row(list(df.columns))
+    for row in zip(*columns):
+        append_row(row)
+
+
+def parse_cell(value):
+    """
+    Convert one CSV text value the way pd.read_csv's default parsing would
+    
+    Parameters:
+    value (str): Raw CSV field
+    
+    Returns:
+    None, bool, int, float or str: Missing, boolean, numeric or text cell value
+    """
+    
+    if value in NA_VALUES:
+        return None
+    if value in BOOL_VALUES:
+        return BOOL_VALUES[value]
+    
+    # int() and float() accept '_' digit separators and non-ASCII digits,
+    # pd.read_csv keeps those as text
+    if '_' in value or not value.isascii():
+        return value
+    
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    
+    # Infinities are written as text, as in write_sheet
+    if math.isinf(number):
+        return 'inf' if number > 0 else '-inf'
+    return value if math.isnan(number) else number
+
+
+def stream_csv_to_sheet(writer, sheet_name, csv_file, timestamp):
+    """
+    Copy CSV rows straight into a new sheet without building a dataframe
+    
+    Values are converted cell by cell with parse_cell, so numbers and booleans are
+    typed the same with either writer engine; a column that mixes numbers and text
+    keeps its numbers, where pd.read_csv would make it all text
+    
+    Parameters:
+    writer (pd.ExcelWriter): Open Excel writer
+    sheet_name (str): Name of the sheet to create
+    csv_file (str or Path): Path to the CSV file
+    timestamp (str): Value for the create_ts and updt_ts columns
+    
+    Returns:
+    int: Number of data rows written
+    """
+    
+    # utf-8-sig drops a leading BOM, matching pd.read_csv's default encoding
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        # Skip blank lines, as pd.read_csv does
+        csv_reader = csv.reader(f)
+        reader = filter(None, csv_reader)
+        
+        header = next(reader, None)
+        if header is None:
+            raise pd.errors.EmptyDataError("No columns to parse from file")
+        
+        append_row = sheet_row_writer(writer, sheet_name)
+        append_row(['seqno', *column_names(header), 'create_ts', 'updt_ts'])
+        
+        # The timestamp cells are the same on every row
+        row_num = 0
+        timestamps = (timestamp, timestamp)
+        for row_num, row in enumerate(reader, 1):
+            # Rows longer than the header are rejected, as pd.read_csv does
+            if len(row) > len(header):
+                raise pd.errors.ParserError(
+                    f"Expected {len(header)} fields in line {csv_reader.line_num}, saw {len(row)}"
+                )
+            append_row((row_num, *map(parse_cell, row), *timestamps))
+    
+    return row_num
+
+
+def unique_sheet_names(names):
+    """
+    Truncate names to Excel's 31 character sheet name limit, numbering any duplicates
+    
+    Parameters:
+    names (list of str): Proposed sheet names
+    
+    Returns:
+    list of str: Sheet names that are unique, ignoring case as Excel does
+    """
+    
+    used = {}
+    taken = set()
+    sheet_names = []
+    
+    for name in names:
+        base = name[:31]
+        sheet_name = base
+        
+        # Append -1, -2, ... truncating the base so the result still fits
+        while sheet_name.lower() in taken:
+            used[base.lower()] = used.get(base.lower(), 0) + 1
+            suffix = f"-{used[base.lower()]}"
+            sheet_name = base[:31 - len(suffix)] + suffix
+        
+        taken.add(sheet_name.lower())
+        sheet_names.append(sheet_name)
+    
+    return sheet_names
+
+
+def process_folder_csvs(folder_path, stream=False):
     """
     Find all CSV files in a folder and create an Excel file with multiple tabs
     
     Parameters:
     folder_path (str): Path to the folder containing CSV files
+    stream (bool): Copy CSV rows straight into the sheets instead of loading them with pandas
     """
     
     # Ensure folder path exists
@@ -16,68 +296,106 @@ def process_folder_csvs(folder_path):
         print(f"Error: Folder '{folder_path}' does not exist")
         return
     
-    # Find all CSV files in the folder
-    csv_pattern = os.path.join(folder_path, "*.csv")
-    csv_files = glob.glob(csv_pattern)
+    # Find all CSV files in the folder, sorted for consistent ordering
+    # Hidden files (e.g. macOS ._ resource forks) are skipped, as glob.glob does
+    folder = Path(folder_path)
+    csv_files = sorted(f for f in folder.glob("*.csv") if not f.name.startswith('.'))
     
     if len(csv_files) == 0:
         print(f"No CSV files found in folder: {folder_path}")
         return
     
-    # Sort files for consistent ordering
-    csv_files.sort()
-    
     print(f"Found {len(csv_files)} CSV files:")
     for f in csv_files:
-        print(f"  - {os.path.basename(f)}")
+        print(f"  - {f.name}")
     
     # If more than 3 files, take first 3
     if len(csv_files) > 3:
         print(f"\nUsing first 3 CSV files (found {len(csv_files)} total)")
         csv_files = csv_files[:3]
     
-    # Generate Excel filename with timestamp
+    # Use filename without extension as sheet name
+    # Ensure sheet names are valid and distinct (Excel has 31 character limit)
+    display_names = [f.name for f in csv_files]
+    sheet_names = unique_sheet_names([f.stem for f in csv_files])
+    
+    # One run timestamp, formatted for the Excel filename and for every sheet's columns
     current_time = datetime.now()
-    timestamp = current_time.strftime("%Y%m%d-%H%M%S")
-    excel_filename = f"test-data-load-{timestamp}.xlsx"
+    file_ts = current_time.strftime("%Y%m%d-%H%M%S")
+    col_ts = current_time.strftime("%Y-%m-%d %I:%M%p")
     
     # Ensure Excel file is saved in the same directory
-    excel_path = os.path.join(folder_path, excel_filename)
+    excel_filename = f"test-data-load-{file_ts}.xlsx"
+    excel_path = folder / excel_filename
+    
+    try:
+        import xlsxwriter  # noqa: F401
+        engine = 'xlsxwriter'
+    except ImportError:
+        engine = 'openpyxl'
+    
+    # Read CSV files concurrently; the parsers release the GIL while parsing
+    futures = []
+    if not stream:
+        with ThreadPoolExecutor(max_workers=len(csv_files)) as executor:
+            futures = [executor.submit(load_csv, csv_file, col_ts) for csv_file in csv_files]
     
     # Create Excel writer object
-    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+    if engine == 'xlsxwriter':
+        # constant_memory streams rows to disk; the string scans are not needed for plain data
+        # Sheet data is spooled to temp files next to the output, and the writer's
+        # context exit does the single save
+        writer_options = {
+            'constant_memory': True,
+            'in_memory': False,
+            'tmpdir': str(folder),
+            'strings_to_urls': False,
+            'strings_to_formulas': False,
+        }
         
-        for i, csv_file in enumerate(csv_files):
-            try:
-                # Read CSV file
-                df = pd.read_csv(csv_file)
-                
-                # Add sequence number as first column
-                df.insert(0, 'seqno', range(1, len(df) + 1))
-                
-                # Add timestamp columns
-                current_time = datetime.now()
-                timestamp = current_time.strftime("%Y-%m-%d %I:%M%p")
-                df['create_ts'] = timestamp
-                df['updt_ts'] = timestamp
-                
-                # Use filename without extension as sheet name
-                sheet_name = os.path.splitext(os.path.basename(csv_file))[0]
-                
-                # Ensure sheet name is valid (Excel has 31 character limit)
-                sheet_name = sheet_name[:31]
+        engine_kwargs = {'options': writer_options}
+    else:
+        # Write-only openpyxl workbooks stream rows instead of building a cell tree
+        engine_kwargs = {'write_only': True}
+    
+    # Progress messages are collected and printed together once the workbook is
+    # saved, or before an error propagates
+    messages = []
+    
+    try:
+        with pd.ExcelWriter(excel_path, engine=engine, engine_kwargs=engine_kwargs) as writer:
+            
+            # Write sheets in order on the main thread (the writer is not thread-safe)
+            for i, csv_file in enumerate(csv_files):
+                sheet_name = sheet_names[i]
                 
-                # Write dataframe to Excel sheet
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
+                # Only missing and empty files are skipped, anything else is a real failure
+                try:
+                    if stream:
+                        row_count = stream_csv_to_sheet(writer, sheet_name, csv_file, col_ts)
+                    else:
+                        # Collect the parsed CSV file
+                        df = futures[i].result()
+                except FileNotFoundError:
+                    messages.append(f"Error: File '{csv_file}' not found")
+                    continue
+                except pd.errors.EmptyDataError:
+                    messages.append(f"Error: File '{csv_file}' is empty")
+                    continue
                 
-                print(f"Successfully added '{os.path.basename(csv_file)}' to sheet '{sheet_name}' with {len(df)} rows and timestamp: {timestamp}")
+                if not stream:
+                    # Write dataframe to Excel sheet
+                    write_sheet(writer, sheet_name, df)
+                    row_count = len(df)
                 
-            except FileNotFoundError:
-                print(f"Error: File '{csv_file}' not found")
-            except pd.errors.EmptyDataError:
-                print(f"Error: File '{csv_file}' is empty")
-            except Exception as e:
-                print(f"Error processing '{csv_file}': {str(e)}")
+                messages.append(f"Successfully added '{display_names[i]}' to sheet '{sheet_name}' with {row_count} rows and timestamp: {col_ts}")
+    except BaseException:
+        # The writer still saves the workbook on the way out; do not leave a partial one behind
+        excel_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if messages:
+            print("\n".join(messages))
     
     print(f"Excel file created at: {excel_path}")
 
@@ -4,6 +4,7 @@ import os
 import tempfile
 import shutil
 import glob
+import itertools
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 import sys
@@ -161,6 +162,210 @@ class TestCSVToExcelConverter(unittest.TestCase):
             process_folder_csvs(self.test_dir)
             self.assertTrue(True)  # Test passes if no exception raised
     
+    @patch('builtins.print')
+    def test_process_folder_csvs_stream(self, mock_print):
+        """Test that streaming CSV rows gives the same sheets as the pandas path."""
+        for stream in (True, False):
+            process_folder_csvs(self.test_dir, stream=stream)
+            
+            excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+            self.assertEqual(len(excel_files), 1)
+            
+            for csv_file in self.csv_files:
+                sheet_name = os.path.splitext(os.path.basename(csv_file))[0]
+                df = pd.read_excel(excel_files[0], sheet_name=sheet_name)
+                original = pd.read_csv(csv_file)
+                
+                self.assertEqual(list(df.columns), ['seqno', *original.columns, 'create_ts', 'updt_ts'])
+                self.assertEqual(df['seqno'].tolist(), list(range(1, len(original) + 1)))
+                pd.testing.assert_frame_equal(df[list(original.columns)], original)
+            os.remove(excel_files[0])
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_stream_tokens(self, mock_print):
+        """Test that booleans, NA tokens and header names match across the default, pandas and stream paths."""
+        shutil.rmtree(self.test_dir)
+        os.makedirs(self.test_dir)
+        
+        with open(os.path.join(self.test_dir, 'flags.csv'), 'w', encoding='utf-8') as f:
+            f.write("id,active,note,code,amount,nick,nick,\n")
+            f.write("1,True,NA,1_000,1.5,ann,NA,p\n")
+            f.write("2,false,nan,abc,,,bob,q\n")
+            f.write("3,TRUE,,١٢,NULL,cy,N/A,r\n")
+        
+        sheets = []
+        for stream in (None, False, True):
+            args = () if stream is None else (stream,)
+            process_folder_csvs(self.test_dir, *args)
+            
+            excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+            self.assertEqual(len(excel_files), 1)
+            
+            with pd.ExcelFile(excel_files[0]) as xls:
+                self.assertEqual(xls.sheet_names, ['flags'])
+                sheets.append(pd.read_excel(xls, sheet_name='flags', header=None))
+            os.remove(excel_files[0])
+        
+        # Header row as written, before read_excel would rename anything
+        self.assertEqual(sheets[0].iloc[0].tolist(), [
+            'seqno', 'id', 'active', 'note', 'code', 'amount', 'nick', 'nick.1', 'Unnamed: 7', 'create_ts', 'updt_ts'
+        ])
+        
+        df = sheets[0].iloc[1:]
+        self.assertEqual(df[2].tolist(), [True, False, True])
+        self.assertEqual(df[4].tolist(), ['1_000', 'abc', '١٢'])
+        self.assertTrue(df[3].isna().all())
+        self.assertEqual(df[6].isna().tolist(), [False, True, False])
+        self.assertEqual(df[7].isna().tolist(), [True, False, True])
+        for other in sheets[1:]:
+            pd.testing.assert_frame_equal(other, sheets[0])
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_stream_utf8_bom(self, mock_print):
+        """Test that streaming drops a UTF-8 BOM and decodes non-ASCII text as UTF-8."""
+        with open(os.path.join(self.test_dir, 'employees.csv'), 'w', encoding='utf-8-sig') as f:
+            f.write("name,city\nZoë,Malmö\n")
+        
+        process_folder_csvs(self.test_dir, stream=True)
+        
+        excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+        self.assertEqual(len(excel_files), 1)
+        
+        df = pd.read_excel(excel_files[0], sheet_name='employees')
+        self.assertEqual(list(df.columns), ['seqno', 'name', 'city', 'create_ts', 'updt_ts'])
+        self.assertEqual(df[['name', 'city']].values.tolist(), [['Zoë', 'Malmö']])
+    
+    def test_load_csv_arrow_frame(self):
+        """Test the frame built on the PyArrow path: seqno, Categorical timestamps and date text."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        from csv_to_excel_converter import load_csv
+        
+        csv_file = os.path.join(self.test_dir, 'events.csv')
+        with open(csv_file, 'w') as f:
+            f.write("event,day,at,utc,time\n")
+            f.write("a,2024-01-05,2024-01-05T10:30:00,2024-01-05T10:30:00Z,10:30\n")
+            f.write("b,2024-01-06,2024-01-06T11:00:00,2024-01-06T11:00:00Z,11:00\n")
+        
+        df = load_csv(csv_file, '2024-01-07 09:00AM')
+        
+        self.assertEqual(list(df.columns), ['seqno', 'event', 'day', 'at', 'utc', 'time', 'create_ts', 'updt_ts'])
+        self.assertEqual(df['seqno'].tolist(), [1, 2])
+        for column in ('create_ts', 'updt_ts'):
+            self.assertIsInstance(df[column].dtype, pd.CategoricalDtype)
+            self.assertEqual(list(df[column].cat.categories), ['2024-01-07 09:00AM'])
+            self.assertEqual(df[column].tolist(), ['2024-01-07 09:00AM'] * 2)
+        self.assertEqual(df['day'].tolist(), ['2024-01-05', '2024-01-06'])
+        self.assertEqual(df['at'].tolist(), ['2024-01-05T10:30:00', '2024-01-06T11:00:00'])
+        self.assertEqual(df['utc'].tolist(), ['2024-01-05T10:30:00Z', '2024-01-06T11:00:00Z'])
+        self.assertEqual(df['time'].tolist(), ['10:30', '11:00'])
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_skips_hidden_files(self, mock_print):
+        """Test that hidden CSV files such as macOS resource forks are not picked up."""
+        with open(os.path.join(self.test_dir, '._employees.csv'), 'wb') as f:
+            f.write(b"\x00\x05\x16\x07\x00\x02\x00\x00")
+        
+        process_folder_csvs(self.test_dir)
+        
+        excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+        self.assertEqual(len(excel_files), 1)
+        
+        with pd.ExcelFile(excel_files[0]) as xls:
+            self.assertEqual(xls.sheet_names, ['employees', 'products', 'sales'])
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_failure_removes_workbook(self, mock_print):
+        """Test that a file that fails to parse aborts the run without leaving a partial workbook."""
+        with open(os.path.join(self.test_dir, 'f_bad.csv'), 'w') as f:
+            f.write("a,b\n1,2\n3,4,5,6\n")
+        
+        for stream in (False, True):
+            mock_print.reset_mock()
+            
+            with self.assertRaises(pd.errors.ParserError):
+                process_folder_csvs(self.test_dir, stream=stream)
+            
+            excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+            self.assertEqual(excel_files, [])
+            
+            # Messages for files handled before the failure are still shown
+            printed = "\n".join(str(arg) for call in mock_print.call_args_list for arg in call.args)
+            self.assertIn("Successfully added 'employees.csv' to sheet 'employees'", printed)
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_without_xlsxwriter(self, mock_print):
+        """Test that the openpyxl writer is used when xlsxwriter is not installed."""
+        for stream in (False, True):
+            with patch.dict(sys.modules, {'xlsxwriter': None}):
+                process_folder_csvs(self.test_dir, stream=stream)
+            
+            excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+            self.assertEqual(len(excel_files), 1)
+            
+            with pd.ExcelFile(excel_files[0]) as xls:
+                self.assertEqual(xls.sheet_names, ['employees', 'products', 'sales'])
+                df = pd.read_excel(xls, sheet_name='employees')
+            pd.testing.assert_frame_equal(df[['Name', 'Age', 'City']], pd.DataFrame(self.sample_data1))
+            self.assertEqual(df['seqno'].tolist(), [1, 2, 3])
+            os.remove(excel_files[0])
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_skips_empty_file(self, mock_print):
+        """Test that an empty CSV file is reported and the other sheets are still written."""
+        empty_file = os.path.join(self.test_dir, 'empty.csv')
+        
+        for contents, stream in itertools.product(("", "\n", "\n\n"), (False, True)):
+            with open(empty_file, 'w') as f:
+                f.write(contents)
+            mock_print.reset_mock()
+            
+            process_folder_csvs(self.test_dir, stream=stream)
+            
+            excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+            self.assertEqual(len(excel_files), 1)
+            
+            with pd.ExcelFile(excel_files[0]) as xls:
+                self.assertEqual(xls.sheet_names, ['employees', 'products'])
+            printed = "\n".join(str(arg) for call in mock_print.call_args_list for arg in call.args)
+            self.assertIn(f"Error: File '{empty_file}' is empty", printed)
+            os.remove(excel_files[0])
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_long_names(self, mock_print):
+        """Test that CSV names sharing a 31 character prefix get distinct sheet names."""
+        shutil.rmtree(self.test_dir)
+        os.makedirs(self.test_dir)
+        
+        prefix = 'quarterly_regional_sales_report'
+        for suffix in ('_north', '_south'):
+            pd.DataFrame(self.sample_data3).to_csv(os.path.join(self.test_dir, f"{prefix}{suffix}.csv"), index=False)
+        
+        process_folder_csvs(self.test_dir)
+        
+        excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+        self.assertEqual(len(excel_files), 1)
+        
+        with pd.ExcelFile(excel_files[0]) as xls:
+            self.assertEqual(xls.sheet_names, [prefix, prefix[:29] + '-1'])
+    
+    @patch('builtins.print')
+    def test_process_folder_csvs_infinite_values(self, mock_print):
+        """Test that infinite floats are written as text, like df.to_excel does."""
+        with open(os.path.join(self.test_dir, 'readings.csv'), 'w') as f:
+            f.write("sensor,value\na,inf\nb,-inf\nc,1.5\n")
+        os.remove(self.csv_files[2])
+        
+        process_folder_csvs(self.test_dir, stream=False)
+        
+        excel_files = glob.glob(os.path.join(self.test_dir, "test-data-load-*.xlsx"))
+        self.assertEqual(len(excel_files), 1)
+        
+        df = pd.read_excel(excel_files[0], sheet_name='readings', dtype={'value': str})
+        self.assertEqual(df['value'].tolist(), ['inf', '-inf', '1.5'])
+    
     def test_timestamp_format(self):
         """Test timestamp format generation."""
         current_time = datetime.now()